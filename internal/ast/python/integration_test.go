@@ -1,9 +1,13 @@
 package python
 
 import (
+	"encoding/json"
 	"os"
+	"os/exec"
 	"path/filepath"
+	"strings"
 	"testing"
+	"unicode/utf8"
 )
 
 func TestPythonParser_BasicIntegration(t *testing.T) {
@@ -217,3 +221,83 @@ func TestPythonParser_IntegrationErrorHandling(t *testing.T) {
 		t.Error("Expected valid context for comment-only file")
 	}
 }
+
+// runBatch runs the extractor in --batch mode over files, with env added to
+// the environment, and returns one decoded result per input path
+func runBatch(t *testing.T, files, env []string) []PythonExtractorOutput {
+	t.Helper()
+
+	parser := NewPythonParser()
+	if err := parser.ensureInitialized(); err != nil {
+		t.Fatalf("Failed to initialize parser: %v", err)
+	}
+
+	// #nosec G204 - pythonPath and extractorPath are controlled internally and validated
+	cmd := exec.Command(parser.pythonPath, parser.extractorPath, "--batch")
+	cmd.Env = append(os.Environ(), env...)
+	cmd.Stdin = strings.NewReader(strings.Join(files, "\n") + "\n")
+	output, err := cmd.Output()
+	if err != nil {
+		t.Fatalf("Batch extraction failed: %v", err)
+	}
+
+	// One JSON document per input path, in input order
+	lines := strings.Split(strings.TrimSpace(string(output)), "\n")
+	if len(lines) != len(files) {
+		t.Fatalf("Expected %d output lines, got %d", len(files), len(lines))
+	}
+
+	results := make([]PythonExtractorOutput, len(lines))
+	for i, line := range lines {
+		if err := json.Unmarshal([]byte(line), &results[i]); err != nil {
+			t.Fatalf("Failed to unmarshal line %d: %v", i, err)
+		}
+	}
+	return results
+}
+
+func TestPythonExtractor_BatchMode(t *testing.T) {
+	mainFile := filepath.Join("..", "..", "..", "testdata", "python-simple", "main.py")
+	modelsFile := filepath.Join("..", "..", "..", "testdata", "python-simple", "models.py")
+
+	tests := []struct {
+		name    string
+		files   []string
+		env     []string
+		errorAt int // index of the one path expected to yield an error record
+	}{
+		{
+			name:    "missing file",
+			files:   []string{mainFile, modelsFile, filepath.Join("..", "..", "..", "testdata", "python-simple", "missing.py")},
+			errorAt: 2,
+		},
+		{
+			// The bad path yields an error record and the batch carries on past it
+			name:  "undecodable path",
+			files: []string{mainFile, "missing-\xff.py", modelsFile},
+			// Force strict UTF-8 text decoding of stdin, as under a UTF-8 locale
+			env:     []string{"PYTHONIOENCODING=utf-8"},
+			errorAt: 1,
+		},
+	}
+
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			results := runBatch(t, tt.files, tt.env)
+
+			for i, result := range results {
+				// Invalid UTF-8 comes back with replacement characters
+				if utf8.ValidString(tt.files[i]) && result.Path != tt.files[i] {
+					t.Errorf("Line %d: expected path %s, got %s", i, tt.files[i], result.Path)
+				}
+
+				if i == tt.errorAt && len(result.Errors) == 0 {
+					t.Errorf("Expected an error for %q", tt.files[i])
+				}
+				if i != tt.errorAt && (len(result.Errors) > 0 || len(result.Functions)+len(result.Types) == 0) {
+					t.Errorf("Expected %s to parse cleanly, got errors %v", tt.files[i], result.Errors)
+				}
+			}
+		})
+	}
+}
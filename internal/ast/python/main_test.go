@@ -0,0 +1,25 @@
+package python
+
+import (
+	"fmt"
+	"os"
+	"testing"
+)
+
+// TestMain points the extractor's result cache at a temporary directory so the
+// tests never read from or write to the user's ~/.cache/rcp-ast
+func TestMain(m *testing.M) {
+	cacheDir, err := os.MkdirTemp("", "rcp-ast-cache-")
+	if err != nil {
+		fmt.Fprintf(os.Stderr, "failed to create cache directory: %v\n", err)
+		os.Exit(1)
+	}
+	if err := os.Setenv("RCP_AST_CACHE", cacheDir); err != nil {
+		fmt.Fprintf(os.Stderr, "failed to set RCP_AST_CACHE: %v\n", err)
+		os.Exit(1)
+	}
+
+	code := m.Run()
+	_ = os.RemoveAll(cacheDir)
+	os.Exit(code)
+}
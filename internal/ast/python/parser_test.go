@@ -769,6 +769,80 @@ if __name__ == "__main__":
 	t.Logf("Call graph generation test completed successfully")
 }
 
+// TestPythonParser_NestedFunctionCallAttribution validates that calls are recorded on the
+// enclosing function even when nested functions share a name
+func TestPythonParser_NestedFunctionCallAttribution(t *testing.T) {
+	parser := NewPythonParser()
+
+	code := `def outer():
+    def worker():
+        def worker():
+            inner_call()
+        worker()
+        outer_call()
+    worker()
+`
+
+	fileContext, err := parser.ParseFile("nested_calls.py", []byte(code))
+	if err != nil {
+		t.Fatalf("Expected no error, got %v", err)
+	}
+
+	// Functions are reported in definition order, so the enclosing worker comes first
+	var workers []*models.Function
+	for i := range fileContext.Functions {
+		if fileContext.Functions[i].Name == "worker" {
+			workers = append(workers, &fileContext.Functions[i])
+		}
+	}
+	if len(workers) != 2 {
+		t.Fatalf("Expected 2 functions named worker, got %d", len(workers))
+	}
+	enclosing, nested := workers[0], workers[1]
+
+	for _, expected := range []string{"worker", "outer_call"} {
+		if !slices.Contains(enclosing.Calls, expected) {
+			t.Errorf("Expected enclosing worker to call %s, got %v", expected, enclosing.Calls)
+		}
+	}
+	if slices.Contains(enclosing.Calls, "inner_call") {
+		t.Errorf("Expected inner_call to be attributed to the nested worker, got %v", enclosing.Calls)
+	}
+
+	if !slices.Equal(nested.Calls, []string{"inner_call"}) {
+		t.Errorf("Expected nested worker to call only inner_call, got %v", nested.Calls)
+	}
+}
+
+func TestPythonParser_SourceEncoding(t *testing.T) {
+	parser := NewPythonParser()
+
+	t.Run("ByteOrderMark", func(t *testing.T) {
+		code := "\xef\xbb\xbfdef greet():\n    pass\n"
+
+		fileContext, err := parser.ParseFile("bom.py", []byte(code))
+		if err != nil {
+			t.Fatalf("Expected no error, got %v", err)
+		}
+		if len(fileContext.Functions) != 1 || fileContext.Functions[0].Name != "greet" {
+			t.Errorf("Expected function greet, got %v", fileContext.Functions)
+		}
+	})
+
+	t.Run("CodingCookie", func(t *testing.T) {
+		// "café" encoded as Latin-1, as declared by the cookie
+		code := "# -*- coding: latin-1 -*-\ndef caf\xe9():\n    pass\n"
+
+		fileContext, err := parser.ParseFile("latin1.py", []byte(code))
+		if err != nil {
+			t.Fatalf("Expected no error, got %v", err)
+		}
+		if len(fileContext.Functions) != 1 || fileContext.Functions[0].Name != "café" {
+			t.Errorf("Expected function café, got %v", fileContext.Functions)
+		}
+	})
+}
+
 // TestPythonParser_ErrorHandling validates Step 9: Error Handling
 func TestPythonParser_ErrorHandling(t *testing.T) {
 	t.Run("InvalidPythonSyntax", func(t *testing.T) {
@@ -1201,6 +1275,49 @@ result: dict = {"status": "ok"}`
 	}
 }
 
+// TestPythonParser_FunctionLocalsNotModuleVariables validates that only module-level
+// assignments are reported as variables and constants
+func TestPythonParser_FunctionLocalsNotModuleVariables(t *testing.T) {
+	parser := NewPythonParser()
+
+	code := `RETRIES = 3
+timeout = 1.5
+
+def run():
+    attempts = 0
+    LIMIT: int = 10
+    return attempts
+
+if timeout:
+    mode = "fast"
+`
+
+	fileContext, err := parser.ParseFile("locals.py", []byte(code))
+	if err != nil {
+		t.Fatalf("Expected no error, got %v", err)
+	}
+
+	var variables, constants []string
+	for _, variable := range fileContext.Variables {
+		variables = append(variables, variable.Name)
+	}
+	for _, constant := range fileContext.Constants {
+		constants = append(constants, constant.Name)
+	}
+
+	if !slices.Equal(variables, []string{"timeout", "mode"}) {
+		t.Errorf("Expected variables [timeout mode], got %v", variables)
+	}
+	if !slices.Equal(constants, []string{"RETRIES"}) {
+		t.Errorf("Expected constants [RETRIES], got %v", constants)
+	}
+	for _, export := range fileContext.Exports {
+		if export.Name == "attempts" || export.Name == "LIMIT" {
+			t.Errorf("Function local %s should not be exported", export.Name)
+		}
+	}
+}
+
 // TestPythonParser_SpecificImportBugFix tests the specific bug mentioned in the issue:
 // "from typing import Dict returns just 'typing'" should now return "Dict"
 func TestPythonParser_SpecificImportBugFix(t *testing.T) {
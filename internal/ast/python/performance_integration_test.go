@@ -1,7 +1,11 @@
 package python
 
 import (
+	"bytes"
+	"encoding/json"
 	"fmt"
+	"os"
+	"path/filepath"
 	"strings"
 	"testing"
 	"time"
@@ -164,6 +168,126 @@ func TestPythonParser_ConcurrentParsing(t *testing.T) {
 		successCount, duration)
 }
 
+func TestPythonParser_ResultCache(t *testing.T) {
+	cacheDir := t.TempDir()
+	t.Setenv("RCP_AST_CACHE", cacheDir)
+
+	parser := NewPythonParser()
+	code := generateMediumPythonCode(30)
+
+	first, err := parser.ParseFile("cached.py", []byte(code))
+	if err != nil {
+		t.Fatalf("Failed to parse file on cache miss: %v", err)
+	}
+
+	entries, err := os.ReadDir(cacheDir)
+	if err != nil {
+		t.Fatalf("Failed to read cache directory: %v", err)
+	}
+	if len(entries) != 1 {
+		t.Fatalf("Expected 1 cache entry after first parse, got %d", len(entries))
+	}
+	entryPath := filepath.Join(cacheDir, entries[0].Name())
+	entry, err := os.ReadFile(entryPath)
+	if err != nil {
+		t.Fatalf("Failed to read cache entry: %v", err)
+	}
+	if !json.Valid(entry) {
+		t.Errorf("Expected cache entry %s to be JSON", entries[0].Name())
+	}
+
+	// Rename a function in the stored entry, so only a cache hit can return it
+	edited := bytes.ReplaceAll(entry, []byte(`"medium_function_0"`), []byte(`"cached_function_0"`))
+	if bytes.Equal(edited, entry) {
+		t.Fatalf("Expected cache entry to contain medium_function_0")
+	}
+	if err := os.WriteFile(entryPath, edited, 0600); err != nil {
+		t.Fatalf("Failed to rewrite cache entry: %v", err)
+	}
+
+	second, err := parser.ParseFile("cached.py", []byte(code))
+	if err != nil {
+		t.Fatalf("Failed to parse file on cache hit: %v", err)
+	}
+
+	if len(second.Functions) != len(first.Functions) || len(second.Types) != len(first.Types) {
+		t.Errorf("Cached result differs: got %d functions, %d types; expected %d functions, %d types",
+			len(second.Functions), len(second.Types), len(first.Functions), len(first.Types))
+	}
+
+	servedFromCache := false
+	for _, function := range second.Functions {
+		if function.Name == "cached_function_0" {
+			servedFromCache = true
+		}
+	}
+	if !servedFromCache {
+		t.Error("Expected second parse to return the edited cache entry")
+	}
+
+	entries, err = os.ReadDir(cacheDir)
+	if err != nil {
+		t.Fatalf("Failed to read cache directory: %v", err)
+	}
+	if len(entries) != 1 {
+		t.Errorf("Expected cache hit to reuse the entry, found %d entries", len(entries))
+	}
+}
+
+func TestPythonParser_CacheWithoutHomeDirectory(t *testing.T) {
+	// A "~user" cache path that cannot be resolved, as when HOME is unset and
+	// the uid has no passwd entry; the extractor should run uncached
+	t.Setenv("RCP_AST_CACHE", "~rcp-no-such-user/cache")
+	t.Setenv("HOME", "")
+	if err := os.Unsetenv("HOME"); err != nil {
+		t.Fatalf("Failed to unset HOME: %v", err)
+	}
+
+	parser := NewPythonParser()
+	fileContext, err := parser.ParseFile("nohome.py", []byte("def helper():\n    pass\n"))
+	if err != nil {
+		t.Fatalf("Failed to parse file without a home directory: %v", err)
+	}
+
+	if len(fileContext.Functions) != 1 {
+		t.Errorf("Expected 1 function, got %d", len(fileContext.Functions))
+	}
+}
+
+func TestPythonParser_SkipOptionalPasses(t *testing.T) {
+	t.Setenv("RCP_AST_CACHE", t.TempDir())
+	t.Setenv("RCP_SKIP_CALLGRAPH", "1")
+	t.Setenv("RCP_SKIP_EXPORTS", "1")
+
+	parser := NewPythonParser()
+	code := `def helper():
+    pass
+
+def main():
+    helper()
+`
+
+	fileContext, err := parser.ParseFile("skip.py", []byte(code))
+	if err != nil {
+		t.Fatalf("Failed to parse file: %v", err)
+	}
+
+	if len(fileContext.Functions) != 2 {
+		t.Fatalf("Expected 2 functions, got %d", len(fileContext.Functions))
+	}
+	if len(fileContext.Exports) != 0 {
+		t.Errorf("Expected no exports when RCP_SKIP_EXPORTS is set, got %d", len(fileContext.Exports))
+	}
+	for _, function := range fileContext.Functions {
+		if len(function.CalledBy) != 0 {
+			t.Errorf("Expected no callers for %s when RCP_SKIP_CALLGRAPH is set, got %v", function.Name, function.CalledBy)
+		}
+		if function.Name == "main" && len(function.Calls) != 1 {
+			t.Errorf("Expected main to still record its call, got %v", function.Calls)
+		}
+	}
+}
+
 // Helper function to generate large Python code
 func generateLargePythonCode(numFunctions, numClasses int) string {
 	var builder strings.Builder
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """Models module for testing Python class parsing."""
 
-from typing import List, Dict, Optional, Any, Protocol
+import sys
+from typing import Callable, List, Dict, Iterable, Optional, Any, Protocol, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
@@ -12,6 +13,9 @@ MAX_USERS = 100
 DEFAULT_TIMEOUT = 30.0
 SERVICE_VERSION = "1.0.0"
 DEBUG_MODE = True
+# Longer user names and emails are not interned, so one-off large strings
+# are not kept alive for the life of the process
+_INTERN_MAX_LENGTH = 256
 
 # Module-level variables
 global_config: Optional["Config"] = None
@@ -19,8 +23,16 @@ user_count = 0
 service_registry: Dict[str, Any] = {}
 is_initialized = False
 
+# Canonical instance of each distinct Address, see Address.intern. Once the
+# cache is full, new addresses are returned as given instead of being added.
+MAX_CACHED_ADDRESSES = 10000
+_address_cache: Dict["Address", "Address"] = {}
 
-@dataclass
+# Bit position of each feature flag in Config.features, assigned on first use
+_feature_bits: Dict[str, int] = {}
+
+
+@dataclass(frozen=True)
 class Address:
     """Represents a user's address."""
 
@@ -30,6 +42,16 @@ class Address:
     zip_code: str
     country: str = "USA"
 
+    @classmethod
+    def intern(cls, address: "Address") -> "Address":
+        """Return the shared instance equal to address, registering it if new."""
+        cached = _address_cache.get(address)
+        if cached is not None:
+            return cached
+        if len(_address_cache) < MAX_CACHED_ADDRESSES:
+            _address_cache[address] = address
+        return address
+
     def __str__(self) -> str:
         """Return formatted address string."""
         return (
@@ -38,29 +60,33 @@ class Address:
 
     def validate(self) -> bool:
         """Validate the address fields."""
-        if not self.street.strip():
-            return False
-        if not self.city.strip():
-            return False
-        return True
+        street, city = self.street, self.city
+        return bool(street and not street.isspace() and city and not city.isspace())
 
 
 class Config:
     """Application configuration class."""
 
+    __slots__ = ("database_url", "port", "log_level", "features")
+
     def __init__(self, database_url: str = "localhost:5432", port: int = 8080):
         self.database_url = database_url
         self.port = port
         self.log_level = "info"
-        self.features: Dict[str, bool] = {}
+        self.features = 0
 
     def set_feature(self, feature: str, enabled: bool) -> None:
         """Enable or disable a feature."""
-        self.features[feature] = enabled
+        mask = 1 << _feature_bits.setdefault(feature, len(_feature_bits))
+        if enabled:
+            self.features |= mask
+        else:
+            self.features &= ~mask
 
     def is_feature_enabled(self, feature: str) -> bool:
         """Check if a feature is enabled."""
-        return self.features.get(feature, False)
+        bit = _feature_bits.get(feature)
+        return bit is not None and bool(self.features >> bit & 1)
 
     @classmethod
     def create_default(cls) -> "Config":
@@ -74,13 +100,17 @@ class Config:
 class User:
     """Represents a user in the system."""
 
-    def __init__(self, user_id: int, name: str, email: str):
-        """Initialize a new User."""
+    __slots__ = ("id", "name", "email", "is_active", "created_at", "profile")
+
+    def __init__(
+        self, user_id: int, name: str, email: str, *, now: Optional[datetime] = None
+    ):
+        """Initialize a new User, optionally with a shared ``now``."""
         self.id = user_id
-        self.name = name
-        self.email = email
+        self.name = sys.intern(name) if len(name) <= _INTERN_MAX_LENGTH else name
+        self.email = sys.intern(email) if len(email) <= _INTERN_MAX_LENGTH else email
         self.is_active = True
-        self.created_at = datetime.now()
+        self.created_at = now if now is not None else datetime.now()
         self.profile: Optional["Profile"] = None
 
     def __str__(self) -> str:
@@ -104,34 +134,52 @@ class User:
 class Profile:
     """User profile with extended information."""
 
-    def __init__(self, user_id: int):
-        """Initialize a new Profile."""
+    __slots__ = ("user_id", "bio", "address", "skills", "created_at", "updated_at")
+
+    def __init__(self, user_id: int, *, now: Optional[datetime] = None):
+        """Initialize a new Profile, optionally with a shared ``now``."""
         self.user_id = user_id
         self.bio = ""
         self.address: Optional[Address] = None
-        self.skills: List[str] = []
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self.skills: Dict[str, None] = {}
+        if now is None:
+            now = datetime.now()
+        self.created_at = now
+        self.updated_at = now
 
     def add_skill(self, skill: str) -> None:
         """Add a skill to the profile."""
         if skill not in self.skills:
-            self.skills.append(skill)
+            self.skills[skill] = None
+            self.updated_at = datetime.now()
+
+    def bulk_add_skills(self, skills: Iterable[str]) -> None:
+        """Add several skills, reading the clock once for the whole batch."""
+        added = False
+        for skill in skills:
+            if skill not in self.skills:
+                self.skills[skill] = None
+                added = True
+        if added:
             self.updated_at = datetime.now()
 
     def remove_skill(self, skill: str) -> None:
         """Remove a skill from the profile."""
         if skill in self.skills:
-            self.skills.remove(skill)
+            del self.skills[skill]
             self.updated_at = datetime.now()
 
+    def get_skills(self) -> List[str]:
+        """Return the skills in the order they were added."""
+        return list(self.skills)
+
     def get_skill_count(self) -> int:
         """Return the number of skills."""
         return len(self.skills)
 
     def set_address(self, address: Address) -> None:
         """Set the profile address."""
-        self.address = address
+        self.address = Address.intern(address)
         self.updated_at = datetime.now()
 
 
@@ -154,6 +202,10 @@ class Repository(ABC):
         """Find all entities."""
         pass
 
+    def iter_all(self) -> Iterable[Any]:
+        """Iterate over all entities without building a list, if supported."""
+        return iter(self.find_all())
+
     @abstractmethod
     def delete(self, entity_id: int) -> bool:
         """Delete entity by ID."""
@@ -187,35 +239,55 @@ class InMemoryUserRepository(Repository):
         """Initialize the repository."""
         self._users: Dict[int, User] = {}
         self._next_id = 1
+        # Bound once so the lookup methods skip the self._users.<method> chain
+        self._get = self._users.get
+        self._set = self._users.__setitem__
+        self._pop = self._users.pop
 
     def save(self, entity: User) -> bool:
         """Save a user entity."""
         if entity.id == 0:
-            entity.id = self._next_id
-            self._next_id += 1
-
-        self._users[entity.id] = entity
+            self.save_new(entity)
+        else:
+            self._set(entity.id, entity)
         return True
 
+    def save_new(self, entity: User) -> int:
+        """Save a user that has no ID yet, assigning the next one."""
+        user_id = self._next_id
+        self._next_id = user_id + 1
+        entity.id = user_id
+        self._set(user_id, entity)
+        return user_id
+
     def find_by_id(self, entity_id: int) -> Optional[User]:
         """Find user by ID."""
-        return self._users.get(entity_id)
+        return self._get(entity_id)
 
     def find_all(self) -> List[User]:
         """Find all users."""
         return list(self._users.values())
 
+    def iter_all(self) -> Iterable[User]:
+        """Iterate over all users; prefer this to find_all when streaming."""
+        return self._users.values()
+
     def delete(self, entity_id: int) -> bool:
         """Delete user by ID."""
-        if entity_id in self._users:
-            del self._users[entity_id]
-            return True
-        return False
+        return self._pop(entity_id, None) is not None
+
+    def bind_lookups(self) -> Tuple[Callable, Callable, Callable]:
+        """Return bound find_by_id, save and delete to hoist out of hot loops."""
+        return self.find_by_id, self.save, self.delete
 
     def get_user_count(self) -> int:
         """Get total number of users."""
         return len(self._users)
 
+    def count_active(self) -> int:
+        """Count the users that are currently active."""
+        return sum(1 for user in self._users.values() if user.is_active)
+
 
 def create_default_config() -> Config:
     """Factory function to create default configuration."""